@@ -14,73 +14,107 @@ import argparse
 import json
 import os
 import re
+import socket
 import sys
-import subprocess
+import time
 import urllib.error
 import urllib.parse
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta, timezone
 from email.utils import parsedate_to_datetime
+from typing import Optional
 from xml.etree import ElementTree
 
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is used when it is not installed
+    orjson = None
+
 API_URL = "https://api.x.com/2/tweets/search/recent"
 NITTER_RSS = "https://nitter.net/{username}/rss"
 NITTER_RSS_FALLBACK = "https://r.jina.ai/http://r.jina.ai/https://nitter.net/{username}/rss"
+MAX_FETCH_WORKERS = 32
+FETCH_RETRIES = 2
+FETCH_RETRY_BACKOFF = 0.3
+FETCH_RETRY_STATUSES = (502, 503, 504)
+# Timeouts and reset/refused/aborted connections; DNS and TLS failures fail fast.
+FETCH_RETRY_ERRORS = (socket.timeout, TimeoutError, ConnectionError)
+FEED_PARSE_CHUNK = 64 * 1024
+YT_CHANNEL_CACHE_NAME = ".yt_channel_cache.json"
+FEED_CACHE_NAME = ".feed_etags.json"
+
+_YT_CHANNEL_RE = re.compile(r'"channelId":"(UC[^"]+)"')
+_YT_BROWSE_RE = re.compile(r'"browseId":"(UC[^"]+)"')
+_OFFICIAL_SOURCE_RE = re.compile(
+    "openai|anthropic|deepmind|google|microsoft|cohere|hugging face"
+)
+
+# YouTube @handle -> channel id; loaded from / saved next to the feeds file in main().
+_YT_CHANNEL_CACHE = {}
+# Feed URL -> ETag/Last-Modified plus the items parsed from that response, so a
+# 304 Not Modified can reuse them without downloading or parsing the feed again.
+_FEED_CACHE = {}
+# URLs stored or served from _FEED_CACHE this run; main() drops the rest before saving.
+_FEED_CACHE_USED = set()
 
 
 def _json_out(payload):
-    json.dump(payload, sys.stdout, ensure_ascii=False, indent=2)
+    # indent= forces stdlib json onto its pure-Python encoder; orjson stays in C.
+    if orjson is not None:
+        sys.stdout.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode("utf-8"))
+    else:
+        json.dump(payload, sys.stdout, ensure_ascii=False, indent=2)
     sys.stdout.write("\n")
 
 
-def _load_keywords(path):
-    keywords = []
+def _load_lines(path):
     try:
         with open(path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith("#"):
-                    continue
-                keywords.append(line)
+            lines = f.read().splitlines()
     except FileNotFoundError:
         return []
-    return keywords
+    entries = (line.strip() for line in lines)
+    return [entry for entry in entries if entry and not entry.startswith("#")]
 
 
-def _load_exclude_keywords(path):
-    return [k.lower() for k in _load_keywords(path)]
+def _load_exclude_pattern(path):
+    keywords = _load_lines(path)
+    if not keywords:
+        return None
+    return re.compile("|".join(re.escape(k) for k in keywords), re.IGNORECASE)
 
 
-def _load_accounts(path):
-    accounts = []
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            for line in f:
-                raw = line.strip()
-                if not raw or raw.startswith("#"):
-                    continue
-                accounts.append(raw)
-    except FileNotFoundError:
-        return []
-    return accounts
+def _parse_feed_line(raw):
+    if "|" in raw:
+        label, url = [part.strip() for part in raw.split("|", 1)]
+    else:
+        label, url = "", raw
+    return {"label": label, "url": url}
 
 
 def _load_feeds(path):
-    feeds = []
+    return [_parse_feed_line(raw) for raw in _load_lines(path)]
+
+
+def _load_json_cache(path):
     try:
         with open(path, "r", encoding="utf-8") as f:
-            for line in f:
-                raw = line.strip()
-                if not raw or raw.startswith("#"):
-                    continue
-                if "|" in raw:
-                    label, url = [part.strip() for part in raw.split("|", 1)]
-                else:
-                    label, url = "", raw
-                feeds.append({"label": label, "url": url})
-    except FileNotFoundError:
-        return []
-    return feeds
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_json_cache(path, data):
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
 
 
 def _normalize_account(raw):
@@ -108,24 +142,45 @@ def _start_time_iso(since_hours):
     return start.replace(microsecond=0).isoformat().replace("+00:00", "Z")
 
 
+def _open_url(url, timeout=8, headers=None):
+    # Retry transient failures in-process; returns (body, response headers).
+    request = urllib.request.Request(
+        url, headers={"User-Agent": "x-ai-trends-digest/1.0", **(headers or {})}
+    )
+    for attempt in range(FETCH_RETRIES + 1):
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                return response.read().decode("utf-8"), response.headers
+        except urllib.error.HTTPError as exc:
+            if exc.code not in FETCH_RETRY_STATUSES or attempt == FETCH_RETRIES:
+                raise
+        except OSError as exc:
+            # urlopen wraps connect-time socket errors in URLError.reason.
+            reason = exc.reason if isinstance(exc, urllib.error.URLError) else exc
+            if not isinstance(reason, FETCH_RETRY_ERRORS) or attempt == FETCH_RETRIES:
+                raise
+        time.sleep(FETCH_RETRY_BACKOFF * (2**attempt))
+
+
 def _fetch_url(url, timeout=8):
-    request = urllib.request.Request(url, headers={"User-Agent": "x-ai-trends-digest/1.0"})
-    try:
-        with urllib.request.urlopen(request, timeout=timeout) as response:
-            return response.read().decode("utf-8")
-    except Exception:
-        return _fetch_url_curl(url, timeout=timeout)
+    body, _ = _open_url(url, timeout=timeout)
+    return body
 
 
-def _fetch_url_curl(url, timeout=8):
-    result = subprocess.run(
-        ["curl", "-L", "-sS", "--fail", "--max-time", str(timeout), url],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
-        raise RuntimeError(result.stderr.strip() or f"curl failed with code {result.returncode}")
-    return result.stdout
+def _fetch_url_conditional(url, timeout=8, etag=None, last_modified=None):
+    # Returns (body, etag, last_modified); body is None when the server answers 304.
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    try:
+        body, response_headers = _open_url(url, timeout=timeout, headers=headers)
+    except urllib.error.HTTPError as exc:
+        if exc.code == 304:
+            return None, etag, last_modified
+        raise
+    return body, response_headers.get("ETag"), response_headers.get("Last-Modified")
 
 
 def _fetch_recent(query, start_time, bearer_token, max_results):
@@ -149,37 +204,42 @@ def _fetch_recent(query, start_time, bearer_token, max_results):
 
 
 def _build_items(payload):
-    users = {u.get("id"): u for u in payload.get("includes", {}).get("users", [])}
+    # Hot loop for up to 100 tweets: bind lookups locally and read each field once.
+    users_get = {u.get("id"): u for u in payload.get("includes", {}).get("users", [])}.get
     items = []
+    append = items.append
     for tweet in payload.get("data", []) or []:
-        metrics = tweet.get("public_metrics") or {}
+        tweet_get = tweet.get
+        tweet_id = tweet_get("id")
+        metrics = tweet_get("public_metrics") or {}
+        metrics_get = metrics.get
         engagement = (
-            metrics.get("like_count", 0)
-            + metrics.get("retweet_count", 0)
-            + metrics.get("reply_count", 0)
-            + metrics.get("quote_count", 0)
+            metrics_get("like_count", 0)
+            + metrics_get("retweet_count", 0)
+            + metrics_get("reply_count", 0)
+            + metrics_get("quote_count", 0)
         )
-        author_id = tweet.get("author_id")
-        user = users.get(author_id, {})
+        user = users_get(tweet_get("author_id"), {})
         username = user.get("username")
         url = (
-            f"https://x.com/{username}/status/{tweet.get('id')}"
+            f"https://x.com/{username}/status/{tweet_id}"
             if username
-            else f"https://x.com/i/web/status/{tweet.get('id')}"
+            else f"https://x.com/i/web/status/{tweet_id}"
         )
-        items.append(
+        created_at = tweet_get("created_at")
+        append(
             {
-                "id": tweet.get("id"),
-                "text": tweet.get("text"),
+                "id": tweet_id,
+                "text": tweet_get("text"),
                 "author": user.get("name") or username or "unknown",
                 "username": username,
                 "url": url,
-                "created_at": tweet.get("created_at"),
+                "created_at": created_at,
                 "metrics": metrics,
                 "engagement_score": engagement,
             }
         )
-    items.sort(key=lambda i: (i["engagement_score"], i.get("created_at") or ""), reverse=True)
+    items.sort(key=lambda i: (i["engagement_score"], i["created_at"] or ""), reverse=True)
     return items
 
 
@@ -188,9 +248,8 @@ def _strip_tag(tag):
 
 
 def _iter_children(parent, name):
-    for child in list(parent):
-        if _strip_tag(child.tag) == name:
-            yield child
+    # "{*}name" matches the tag in any namespace or none, like _strip_tag did.
+    return parent.iterfind(f"{{*}}{name}")
 
 
 def _child_text(parent, name):
@@ -220,77 +279,111 @@ def _parse_date(value):
         return None
 
 
-def _parse_rss_items(xml_text, source_label):
-    items = []
-    root = ElementTree.fromstring(xml_text)
-    channel = None
-    for child in _iter_children(root, "channel"):
-        channel = child
-        break
-    if channel is None:
-        return items
-    for item in _iter_children(channel, "item"):
-        title = _child_text(item, "title")
-        link = _child_text(item, "link")
-        pub_date = _child_text(item, "pubDate")
-        created_at = _parse_date(pub_date)
-        items.append(
-            {
-                "id": link or title,
-                "text": title,
-                "author": source_label,
-                "username": None,
-                "url": link,
-                "created_at": created_at,
-                "metrics": {},
-                "engagement_score": 0,
-                "source": source_label,
-            }
-        )
-    return items
+@dataclass
+class FeedItem:
+    # Fixed-shape record for RSS/Atom items; explicit __slots__ (no field defaults)
+    # keeps it compact without needing dataclass(slots=True) from Python 3.10.
+    __slots__ = (
+        "id",
+        "text",
+        "author",
+        "username",
+        "url",
+        "created_at",
+        "metrics",
+        "engagement_score",
+        "source",
+    )
+    id: str
+    text: str
+    author: str
+    username: Optional[str]
+    url: str
+    created_at: Optional[str]
+    metrics: dict
+    engagement_score: int
+    source: str
+
+
+def _feed_item(title, link, created_at, source_label):
+    return FeedItem(
+        id=link or title,
+        text=title,
+        author=source_label,
+        username=None,
+        url=link,
+        created_at=created_at,
+        metrics={},
+        engagement_score=0,
+        source=source_label,
+    )
 
 
-def _parse_atom_items(xml_text, source_label):
-    items = []
-    root = ElementTree.fromstring(xml_text)
-    for entry in _iter_children(root, "entry"):
-        title = _child_text(entry, "title")
-        link = ""
-        for link_node in _iter_children(entry, "link"):
-            rel = link_node.attrib.get("rel", "alternate")
-            href = link_node.attrib.get("href") or ""
-            if rel == "alternate" and href:
-                link = href
-                break
-            if not link and href:
-                link = href
-        updated = _child_text(entry, "updated")
-        published = _child_text(entry, "published")
-        created_at = _parse_date(updated or published)
-        items.append(
-            {
-                "id": link or title,
-                "text": title,
-                "author": source_label,
-                "username": None,
-                "url": link,
-                "created_at": created_at,
-                "metrics": {},
-                "engagement_score": 0,
-                "source": source_label,
-            }
-        )
-    return items
+def _rss_item(item, source_label):
+    title = _child_text(item, "title")
+    link = _child_text(item, "link")
+    created_at = _parse_date(_child_text(item, "pubDate"))
+    return _feed_item(title, link, created_at, source_label)
+
+
+def _atom_item(entry, source_label):
+    title = _child_text(entry, "title")
+    link = ""
+    for link_node in _iter_children(entry, "link"):
+        rel = link_node.attrib.get("rel", "alternate")
+        href = link_node.attrib.get("href") or ""
+        if rel == "alternate" and href:
+            link = href
+            break
+        if not link and href:
+            link = href
+    updated = _child_text(entry, "updated")
+    published = _child_text(entry, "published")
+    created_at = _parse_date(updated or published)
+    return _feed_item(title, link, created_at, source_label)
+
+
+def _iter_feed_items(xml_text, source_label, allow_atom=True):
+    # Stream the document and drop each <item>/<entry> once it has been read,
+    # so memory stays at roughly one entry instead of the whole tree.
+    parser = ElementTree.XMLPullParser(events=("start", "end"))
+    stack = []
+
+    def read_items():
+        for event, elem in parser.read_events():
+            if event == "start":
+                stack.append(elem)
+                continue
+            tag = _strip_tag(elem.tag)
+            item = None
+            if len(stack) == 3 and tag == "item" and _strip_tag(stack[1].tag) == "channel":
+                item = _rss_item(elem, source_label)
+            elif (
+                allow_atom
+                and len(stack) == 2
+                and tag == "entry"
+                and _strip_tag(stack[0].tag) == "feed"
+            ):
+                item = _atom_item(elem, source_label)
+            stack.pop()
+            if item is not None:
+                stack[-1].remove(elem)
+                yield item
+
+    for offset in range(0, len(xml_text), FEED_PARSE_CHUNK):
+        parser.feed(xml_text[offset : offset + FEED_PARSE_CHUNK])
+        yield from read_items()
+    # expat >= 2.6 can defer events until close(), so drain once more afterwards.
+    parser.close()
+    yield from read_items()
+
+
+def _parse_rss_items(xml_text, source_label):
+    return list(_iter_feed_items(xml_text, source_label, allow_atom=False))
 
 
 def _parse_feed(xml_text, source_label):
-    root = ElementTree.fromstring(xml_text)
-    tag = _strip_tag(root.tag)
-    if tag == "rss" or any(_strip_tag(c.tag) == "channel" for c in list(root)):
-        return _parse_rss_items(xml_text, source_label)
-    if tag == "feed":
-        return _parse_atom_items(xml_text, source_label)
-    return []
+    return list(_iter_feed_items(xml_text, source_label))
 
 
 def _fetch_account_feed(username, timeout):
@@ -316,20 +409,20 @@ def _resolve_youtube_feed(url, timeout):
         if "youtube.com/@" in target:
             target = target.split("youtube.com/", 1)[1].strip()
     if target.startswith("@"):
+        channel_id = _YT_CHANNEL_CACHE.get(target)
+        if channel_id:
+            return f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
         handle_url = f"https://www.youtube.com/{target}"
         html = _fetch_url(handle_url, timeout=timeout)
-        match = re.search(r'"channelId":"(UC[^"]+)"', html)
-        if not match:
-            match = re.search(r'"browseId":"(UC[^"]+)"', html)
+        match = _YT_CHANNEL_RE.search(html) or _YT_BROWSE_RE.search(html)
         if not match:
             mirror_url = f"https://r.jina.ai/http://r.jina.ai/{handle_url}"
             html = _fetch_url(mirror_url, timeout=timeout)
-            match = re.search(r'"channelId":"(UC[^"]+)"', html) or re.search(
-                r'"browseId":"(UC[^"]+)"', html
-            )
+            match = _YT_CHANNEL_RE.search(html) or _YT_BROWSE_RE.search(html)
         if not match:
             raise ValueError("Unable to resolve YouTube channel id from handle.")
         channel_id = match.group(1)
+        _YT_CHANNEL_CACHE[target] = channel_id
         return f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
     if target.startswith("UC"):
         return f"https://www.youtube.com/feeds/videos.xml?channel_id={target}"
@@ -341,64 +434,78 @@ def _fetch_feed(feed, timeout):
     url = feed.get("url")
     if url and (url.startswith("youtube:") or url.startswith("yt:") or "youtube.com/@" in url):
         url = _resolve_youtube_feed(url, timeout=timeout)
-    body = _fetch_url(url, timeout=timeout)
-    return _parse_feed(body, label), label
+    cached = _FEED_CACHE.get(url)
+    if cached and cached.get("label") != label:
+        cached = None
+    validators = (cached.get("etag"), cached.get("last_modified")) if cached else (None, None)
+    body, etag, last_modified = _fetch_url_conditional(url, timeout, *validators)
+    if body is None:
+        _FEED_CACHE_USED.add(url)
+        return [FeedItem(**item) for item in cached["items"]], label
+    items = _parse_feed(body, label)
+    if etag or last_modified:
+        _FEED_CACHE_USED.add(url)
+        _FEED_CACHE[url] = {
+            "label": label,
+            "etag": etag,
+            "last_modified": last_modified,
+            "items": [asdict(item) for item in items],
+        }
+    else:
+        # The server stopped sending validators; don't keep replaying the old ones.
+        _FEED_CACHE.pop(url, None)
+    return items, label
 
 
-def _filter_since(items, since_hours):
+def _fetch_concurrently(fetch, targets, timeout, max_workers=MAX_FETCH_WORKERS):
+    # Returns (target, result, exc) in input order; callers collect on the main thread.
+    if not targets:
+        return []
+    outcomes = {}
+    workers = max(1, min(max_workers, len(targets)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(fetch, target, timeout=timeout) for target in targets]
+        for future in as_completed(futures):
+            try:
+                outcomes[future] = (future.result(), None)
+            except Exception as exc:
+                outcomes[future] = (None, exc)
+    return [(target, *outcomes[future]) for target, future in zip(targets, futures)]
+
+
+def _filter_items(items, since_hours, exclude_pattern=None):
+    # Exclude keywords, drop items outside the window and dedupe in a single pass.
     cutoff = datetime.now(timezone.utc) - timedelta(hours=since_hours)
+    excluded = exclude_pattern.search if exclude_pattern is not None else None
+    seen = set()
     filtered = []
     for item in items:
-        created_at = item.get("created_at")
+        text = item.text
+        if excluded is not None and excluded(text or ""):
+            continue
+        created_at = item.created_at
         if not created_at:
             continue
         try:
-            created_dt = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+            # created_at comes from _parse_date, so it is already "+00:00", never "Z".
+            created_dt = datetime.fromisoformat(created_at)
         except ValueError:
             continue
-        if created_dt >= cutoff:
-            filtered.append(item)
-    return filtered
-
-
-def _dedupe(items):
-    seen = set()
-    deduped = []
-    for item in items:
-        key = item.get("url") or item.get("id") or item.get("text")
+        if created_dt < cutoff:
+            continue
+        key = item.url or item.id or text
         if not key or key in seen:
             continue
         seen.add(key)
-        deduped.append(item)
-    return deduped
-
-
-def _filter_excluded(items, exclude_keywords):
-    if not exclude_keywords:
-        return items
-    filtered = []
-    for item in items:
-        text = (item.get("text") or "").lower()
-        if any(k in text for k in exclude_keywords):
-            continue
         filtered.append(item)
     return filtered
 
 
 def _source_weight(item):
-    source = (item.get("source") or item.get("author") or "").lower()
+    source = (item.source or item.author or "").lower()
     if "karpathy" in source:
         return 3
-    official_keywords = (
-        "openai",
-        "anthropic",
-        "deepmind",
-        "google",
-        "microsoft",
-        "cohere",
-        "hugging face",
-    )
-    if any(key in source for key in official_keywords):
+    if _OFFICIAL_SOURCE_RE.search(source):
         return 2
     if "arxiv" in source:
         return 0
@@ -435,12 +542,28 @@ def main():
         default=8,
         help="Per-feed fetch timeout in seconds (RSS/Atom or account RSS)",
     )
+    parser.add_argument(
+        "--fetch-workers",
+        type=int,
+        default=MAX_FETCH_WORKERS,
+        help="Maximum number of feeds/accounts fetched concurrently (1 = sequential)",
+    )
     parser.add_argument(
         "--max-feeds",
         type=int,
         default=0,
         help="Optional limit on number of feeds to fetch (0 = no limit)",
     )
+    parser.add_argument(
+        "--refresh-yt-cache",
+        action="store_true",
+        help="Ignore cached YouTube handle -> channel id lookups and resolve them again",
+    )
+    parser.add_argument(
+        "--refresh-feed-cache",
+        action="store_true",
+        help="Ignore cached feed ETag/Last-Modified validators and download every feed",
+    )
     parser.add_argument(
         "--mode",
         choices=["auto", "keywords", "accounts", "feeds"],
@@ -453,7 +576,7 @@ def main():
     token = os.environ.get("X_BEARER_TOKEN")
 
     if mode in ("auto", "keywords") and token:
-        keywords = _load_keywords(args.keywords_file)
+        keywords = _load_lines(args.keywords_file)
         query = _build_query(keywords)
         if not query:
             _json_out(
@@ -507,7 +630,7 @@ def main():
         return 0
 
     if mode == "accounts":
-        accounts = _load_accounts(args.accounts_file)
+        accounts = _load_lines(args.accounts_file)
         if not accounts:
             _json_out(
                 {
@@ -528,17 +651,17 @@ def main():
 
         items = []
         errors = []
-        for handle in normalized:
-            try:
-                items.extend(_fetch_account_feed(handle, timeout=args.feed_timeout))
-            except Exception as exc:
+        for handle, account_items, exc in _fetch_concurrently(
+            _fetch_account_feed, normalized, args.feed_timeout, args.fetch_workers
+        ):
+            if exc is not None:
                 errors.append({"account": handle, "error": str(exc)})
+                continue
+            items.extend(account_items)
 
-        exclude_keywords = _load_exclude_keywords(args.exclude_keywords_file)
-        items = _filter_excluded(items, exclude_keywords)
-        items = _filter_since(items, args.since_hours)
-        items = _dedupe(items)
-        items.sort(key=lambda i: (i.get("created_at") or ""), reverse=True)
+        exclude_pattern = _load_exclude_pattern(args.exclude_keywords_file)
+        items = _filter_items(items, args.since_hours, exclude_pattern)
+        items.sort(key=lambda i: (i.created_at or ""), reverse=True)
         limited = items[: max(args.limit, 0)]
 
         output = {
@@ -546,7 +669,7 @@ def main():
             "accounts": normalized,
             "limit": args.limit,
             "fetched": len(items),
-            "items": limited,
+            "items": [asdict(item) for item in limited],
         }
         if errors:
             output["errors"] = errors
@@ -570,23 +693,35 @@ def main():
     used_labels = []
     if args.max_feeds and args.max_feeds > 0:
         feeds = feeds[: args.max_feeds]
-    for feed in feeds:
-        url = feed.get("url")
-        if not url:
+    feeds = [feed for feed in feeds if feed.get("url")]
+    yt_cache_path = os.path.join(os.path.dirname(args.feeds_file), YT_CHANNEL_CACHE_NAME)
+    if not args.refresh_yt_cache:
+        _YT_CHANNEL_CACHE.update(_load_json_cache(yt_cache_path))
+    yt_cache_before = dict(_YT_CHANNEL_CACHE)
+    feed_cache_path = os.path.join(os.path.dirname(args.feeds_file), FEED_CACHE_NAME)
+    if not args.refresh_feed_cache:
+        _FEED_CACHE.update(_load_json_cache(feed_cache_path))
+    feed_cache_before = dict(_FEED_CACHE)
+    for feed, result, exc in _fetch_concurrently(
+        _fetch_feed, feeds, args.feed_timeout, args.fetch_workers
+    ):
+        if exc is not None:
+            errors.append({"feed": feed.get("url"), "error": str(exc)})
             continue
-        try:
-            feed_items, label = _fetch_feed(feed, timeout=args.feed_timeout)
-            used_labels.append(label)
-            items.extend(feed_items)
-        except Exception as exc:
-            errors.append({"feed": url, "error": str(exc)})
-
-    exclude_keywords = _load_exclude_keywords(args.exclude_keywords_file)
-    items = _filter_excluded(items, exclude_keywords)
-    items = _filter_since(items, args.since_hours)
-    items = _dedupe(items)
+        feed_items, label = result
+        used_labels.append(label)
+        items.extend(feed_items)
+    if _YT_CHANNEL_CACHE != yt_cache_before:
+        _save_json_cache(yt_cache_path, _YT_CHANNEL_CACHE)
+    for url in _FEED_CACHE.keys() - _FEED_CACHE_USED:
+        del _FEED_CACHE[url]
+    if _FEED_CACHE != feed_cache_before:
+        _save_json_cache(feed_cache_path, _FEED_CACHE)
+
+    exclude_pattern = _load_exclude_pattern(args.exclude_keywords_file)
+    items = _filter_items(items, args.since_hours, exclude_pattern)
     items.sort(
-        key=lambda i: (_source_weight(i), i.get("created_at") or ""),
+        key=lambda i: (_source_weight(i), i.created_at or ""),
         reverse=True,
     )
     limited = items[: max(args.limit, 0)]
@@ -596,7 +731,7 @@ def main():
         "feeds": used_labels,
         "limit": args.limit,
         "fetched": len(items),
-        "items": limited,
+        "items": [asdict(item) for item in limited],
     }
     if errors:
         output["errors"] = errors
@@ -11,40 +11,60 @@ Usage:
 
 import argparse
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from PIL import Image, ImageDraw, ImageFont
 
+FONT_PATH = "/System/Library/Fonts/AppleSDGothicNeo.ttc"
+BACKGROUND_COLOR = (245, 247, 250)
+PANEL_COLOR = (255, 255, 255)
+SUBTITLE = "大模型/AI 热点速览"
 
-def main():
-    parser = argparse.ArgumentParser(description="Generate WeChat cover image")
-    parser.add_argument("--title", default=None)
-    parser.add_argument("--out", required=True)
-    parser.add_argument("--width", type=int, default=900)
-    parser.add_argument("--height", type=int, default=383)
-    parser.add_argument("--quality", type=int, default=80)
-    args = parser.parse_args()
 
-    title = args.title or f"{datetime.now().strftime('%Y-%m-%d')} AI热点日报"
+@lru_cache(maxsize=8)
+def _font(path, size):
+    return ImageFont.truetype(path, size)
 
-    img = Image.new("RGB", (args.width, args.height), "white")
-    draw = ImageDraw.Draw(img)
 
-    font_path = "/System/Library/Fonts/AppleSDGothicNeo.ttc"
-    title_font = ImageFont.truetype(font_path, 42)
-    subtitle_font = ImageFont.truetype(font_path, 26)
+@lru_cache(maxsize=4)
+def _base_canvas(width, height):
+    # Static background + panel; callers draw on a .copy() of this.
+    img = Image.new("RGB", (width, height), BACKGROUND_COLOR)
+    ImageDraw.Draw(img).rectangle([(40, 40), (width - 40, height - 40)], fill=PANEL_COLOR)
+    return img
+
+
+def render_cover(title, out, width=900, height=383, quality=80):
+    img = _base_canvas(width, height).copy()
+    draw = ImageDraw.Draw(img)
 
-    draw.rectangle([(0, 0), (args.width, args.height)], fill=(245, 247, 250))
-    draw.rectangle([(40, 40), (args.width - 40, args.height - 40)], fill=(255, 255, 255))
+    title_font = _font(FONT_PATH, 42)
+    subtitle_font = _font(FONT_PATH, 26)
 
     x = 70
     y = 90
     draw.text((x, y), title, fill=(20, 20, 20), font=title_font)
     y += title_font.size + 20
-    draw.text((x, y), "大模型/AI 热点速览", fill=(90, 90, 90), font=subtitle_font)
+    draw.text((x, y), SUBTITLE, fill=(90, 90, 90), font=subtitle_font)
 
-    out_path = Path(args.out)
+    out_path = Path(out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    img.save(out_path, "JPEG", quality=args.quality, optimize=True)
+    # Progressive scans shrink flat-colour covers; 4:2:0 is pinned explicitly.
+    img.save(out_path, "JPEG", quality=quality, optimize=True, progressive=True, subsampling=2)
+    return out_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate WeChat cover image")
+    parser.add_argument("--title", default=None)
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--width", type=int, default=900)
+    parser.add_argument("--height", type=int, default=383)
+    parser.add_argument("--quality", type=int, default=80)
+    args = parser.parse_args()
+
+    title = args.title or f"{datetime.now().strftime('%Y-%m-%d')} AI热点日报"
+    render_cover(title, args.out, width=args.width, height=args.height, quality=args.quality)
 
 
 if __name__ == "__main__":
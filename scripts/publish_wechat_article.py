@@ -19,49 +19,59 @@ Use --draft-only to create a draft without publishing.
 
 import argparse
 import json
-import os
 import sys
 import urllib.parse
-import urllib.request
 from html import unescape
 import re
-import subprocess
+
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is used when it is not installed
+    orjson = None
+
+from wechat_common import (
+    call_with_token,
+    https_request,
+    read_cached_token,
+    token_cache_path,
+    write_cached_token,
+)
 
 TOKEN_URL = "https://api.weixin.qq.com/cgi-bin/token"
 DRAFT_ADD_URL = "https://api.weixin.qq.com/cgi-bin/draft/add"
 PUBLISH_URL = "https://api.weixin.qq.com/cgi-bin/freepublish/submit"
 
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def _dumps_payload(payload):
+    # draft/add payloads carry the full article HTML; orjson encodes it fastest.
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def _dumps_pretty(payload):
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(payload, ensure_ascii=False, indent=2)
+
 
 def _request_json(url, method="GET", payload=None):
     data = None
     headers = {"Content-Type": "application/json"}
     if payload is not None:
-        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
-    req = urllib.request.Request(url, data=data, headers=headers, method=method)
-    try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            body = resp.read().decode("utf-8")
-        return json.loads(body)
-    except Exception:
-        return _request_json_curl(url, method=method, payload=payload)
-
-
-def _request_json_curl(url, method="GET", payload=None):
-    cmd = ["curl", "-sS", "--fail", "--max-time", "20", "-X", method]
-    resolve_ips = os.environ.get("WECHAT_API_HOST_IPS", "").strip()
-    if resolve_ips:
-        for ip in [p.strip() for p in resolve_ips.split(",") if p.strip()]:
-            cmd += ["--resolve", f"api.weixin.qq.com:443:{ip}"]
-    if payload is not None:
-        cmd += ["-H", "Content-Type: application/json", "-d", json.dumps(payload, ensure_ascii=False)]
-    cmd.append(url)
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        raise RuntimeError(result.stderr.strip() or f"curl failed with code {result.returncode}")
-    return json.loads(result.stdout)
+        data = _dumps_payload(payload)
+    body = https_request(url, method=method, body=data, headers=headers)
+    return json.loads(body.decode("utf-8"))
 
 
-def _get_access_token(app_id, app_secret):
+def _get_access_token(app_id, app_secret, refresh=False):
+    cache_path = token_cache_path(app_id, app_secret)
+    if not refresh:
+        cached = read_cached_token(cache_path)
+        if cached:
+            return cached
     qs = urllib.parse.urlencode(
         {
             "grant_type": "client_credential",
@@ -73,16 +83,30 @@ def _get_access_token(app_id, app_secret):
     data = _request_json(url)
     if "access_token" not in data:
         raise RuntimeError(f"Failed to get access_token: {data}")
+    write_cached_token(cache_path, data["access_token"], data.get("expires_in", 7200))
     return data["access_token"]
 
 
-def _strip_tags(html):
-    text = re.sub(r"<[^>]+>", "", html)
-    return unescape(text).strip()
-
-
 def _build_digest(html, max_len=80):
-    text = _strip_tags(html)
+    # Only the head of the article is needed: strip tags gap by gap and stop as
+    # soon as the visible text is longer than max_len.
+    chunks = []
+    size = 0
+    next_check = max_len + 1
+    pos = 0
+    for match in _TAG_RE.finditer(html):
+        chunks.append(html[pos : match.start()])
+        size += match.start() - pos
+        pos = match.end()
+        if size >= next_check:
+            visible = len(unescape("".join(chunks)).strip())
+            if visible > max_len:
+                break
+            # Unescaping only shrinks text, so at least this much more raw text is needed.
+            next_check = size + max_len - visible + 1
+    else:
+        chunks.append(html[pos:])
+    text = unescape("".join(chunks)).strip()
     if len(text) <= max_len:
         return text
     return text[: max_len - 1] + "…"
@@ -132,25 +156,29 @@ def main():
         print(json.dumps({"error": "html file not found"}, ensure_ascii=False))
         return 2
 
-    token = _get_access_token(args.app_id, args.app_secret)
-    draft = _draft_add(
-        token,
-        args.title,
-        html,
-        args.thumb_media_id,
-        author=args.author,
-        source_url=args.source_url,
+    token, draft = call_with_token(
+        _get_access_token,
+        args.app_id,
+        args.app_secret,
+        lambda token: _draft_add(
+            token,
+            args.title,
+            html,
+            args.thumb_media_id,
+            author=args.author,
+            source_url=args.source_url,
+        ),
     )
     if "media_id" not in draft:
         print(json.dumps({"error": "draft_add failed", "details": draft}, ensure_ascii=False))
         return 3
 
     if args.draft_only:
-        print(json.dumps({"draft": draft, "publish": None}, ensure_ascii=False, indent=2))
+        print(_dumps_pretty({"draft": draft, "publish": None}))
         return 0
 
     publish = _publish(token, draft["media_id"])
-    print(json.dumps({"draft": draft, "publish": publish}, ensure_ascii=False, indent=2))
+    print(_dumps_pretty({"draft": draft, "publish": publish}))
     return 0
 
 
@@ -15,26 +15,36 @@ import argparse
 import json
 import mimetypes
 import os
-import random
-import string
+import secrets
 import urllib.parse
-import urllib.request
+
+from wechat_common import (
+    call_with_token,
+    https_request,
+    read_cached_token,
+    token_cache_path,
+    write_cached_token,
+)
 
 TOKEN_URL = "https://api.weixin.qq.com/cgi-bin/token"
 UPLOAD_URL = "https://api.weixin.qq.com/cgi-bin/material/add_material"
+UPLOAD_CHUNK_SIZE = 64 * 1024
 
 
 def _request_json(url, method="GET", payload=None, headers=None):
     data = None
     if payload is not None:
         data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
-    req = urllib.request.Request(url, data=data, headers=headers or {}, method=method)
-    with urllib.request.urlopen(req, timeout=30) as resp:
-        body = resp.read().decode("utf-8")
-    return json.loads(body)
+    body = https_request(url, method=method, body=data, headers=headers)
+    return json.loads(body.decode("utf-8"))
 
 
-def _get_access_token(app_id, app_secret):
+def _get_access_token(app_id, app_secret, refresh=False):
+    cache_path = token_cache_path(app_id, app_secret)
+    if not refresh:
+        cached = read_cached_token(cache_path)
+        if cached:
+            return cached
     qs = urllib.parse.urlencode(
         {"grant_type": "client_credential", "appid": app_id, "secret": app_secret}
     )
@@ -42,13 +52,12 @@ def _get_access_token(app_id, app_secret):
     data = _request_json(url)
     if "access_token" not in data:
         raise RuntimeError(f"Failed to get access_token: {data}")
+    write_cached_token(cache_path, data["access_token"], data.get("expires_in", 7200))
     return data["access_token"]
 
 
 def _multipart_form(file_field, file_path, extra_fields=None):
-    boundary = "----WebKitFormBoundary" + "".join(
-        random.choice(string.ascii_letters + string.digits) for _ in range(16)
-    )
+    boundary = "----WebKitFormBoundary" + secrets.token_hex(8)
     crlf = "\r\n"
     parts = []
 
@@ -69,24 +78,32 @@ def _multipart_form(file_field, file_path, extra_fields=None):
     parts.append("")
 
     body_pre = crlf.join(parts).encode("utf-8") + crlf.encode("utf-8")
-    with open(file_path, "rb") as f:
-        file_bytes = f.read()
     body_post = (crlf + f"--{boundary}--" + crlf).encode("utf-8")
+    content_length = len(body_pre) + os.path.getsize(file_path) + len(body_post)
+
+    # Stream the file in chunks instead of holding a second copy of it in memory.
+    # Returned as a factory so a retried request gets a fresh iterator.
+    def body():
+        yield body_pre
+        with open(file_path, "rb") as f:
+            while True:
+                chunk = f.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        yield body_post
 
-    body = body_pre + file_bytes + body_post
     content_type = f"multipart/form-data; boundary={boundary}"
-    return body, content_type
+    return body, content_type, content_length
 
 
 def _upload_material(access_token, media_type, file_path):
     qs = urllib.parse.urlencode({"access_token": access_token, "type": media_type})
     url = f"{UPLOAD_URL}?{qs}"
-    body, content_type = _multipart_form("media", file_path)
-    headers = {"Content-Type": content_type}
-    req = urllib.request.Request(url, data=body, headers=headers, method="POST")
-    with urllib.request.urlopen(req, timeout=60) as resp:
-        data = resp.read().decode("utf-8")
-    return json.loads(data)
+    body, content_type, content_length = _multipart_form("media", file_path)
+    headers = {"Content-Type": content_type, "Content-Length": str(content_length)}
+    data = https_request(url, method="POST", body=body, headers=headers, timeout=60)
+    return json.loads(data.decode("utf-8"))
 
 
 def main():
@@ -101,8 +118,12 @@ def main():
         print(json.dumps({"error": "file not found"}, ensure_ascii=False))
         return 2
 
-    token = _get_access_token(args.app_id, args.app_secret)
-    result = _upload_material(token, args.type, args.file)
+    _, result = call_with_token(
+        _get_access_token,
+        args.app_id,
+        args.app_secret,
+        lambda token: _upload_material(token, args.type, args.file),
+    )
     print(json.dumps(result, ensure_ascii=False, indent=2))
     return 0
 
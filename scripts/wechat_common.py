@@ -0,0 +1,212 @@
+"""Helpers shared by the WeChat Official Account scripts.
+
+Imported by publish_wechat_article.py and upload_wechat_material.py, which
+run as `python3 scripts/<name>.py` and so find this module on sys.path.
+"""
+
+import base64
+import hashlib
+import http.client
+import json
+import os
+import socket
+import ssl
+import time
+import urllib.parse
+import urllib.request
+
+API_HOST = "api.weixin.qq.com"
+API_RETRIES = 2
+API_RETRY_BACKOFF = 0.3
+API_RETRY_STATUSES = (500, 502, 503, 504)
+IDEMPOTENT_METHODS = ("GET", "HEAD")
+# Same rule as fetch_x_trends.FETCH_RETRY_ERRORS: timeouts and reset/refused/aborted
+# connections are retried; DNS and TLS failures fail fast.
+API_RETRY_ERRORS = (socket.timeout, TimeoutError, ConnectionError)
+# How a keep-alive socket the server already closed fails before any response
+# (http.client.RemoteDisconnected is a ConnectionResetError).
+STALE_CONNECTION_ERRORS = (ConnectionResetError, BrokenPipeError)
+TOKEN_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache")
+TOKEN_EXPIRY_MARGIN = 300
+# access_token invalid/expired, e.g. revoked early because another client refreshed it.
+TOKEN_ERRCODES = (40001, 40014, 42001)
+
+_CONNECTIONS = {}
+
+
+class PinnedHTTPSConnection(http.client.HTTPSConnection):
+    """HTTPS connection that dials fixed IPs instead of resolving the host.
+
+    Works like curl --resolve: SNI and certificate checks still use ``host``.
+    With ``proxy`` (an ``https_proxy()`` result) the pinned IPs are reached
+    through a CONNECT tunnel instead of directly.
+    """
+
+    def __init__(self, host, ips, port=None, context=None, proxy=None, **kwargs):
+        self.ssl_context = context or ssl.create_default_context()
+        super().__init__(host, port, context=self.ssl_context, **kwargs)
+        self.ips = list(ips)
+        self.proxy = proxy
+
+    def _dial(self, ip):
+        if self.proxy is None:
+            return socket.create_connection((ip, self.port), self.timeout, self.source_address)
+        proxy_host, proxy_port, proxy_headers = self.proxy
+        tunnel = http.client.HTTPConnection(
+            proxy_host, proxy_port, timeout=self.timeout, source_address=self.source_address
+        )
+        tunnel.set_tunnel(ip, self.port, headers=proxy_headers)
+        try:
+            tunnel.connect()
+        except OSError:
+            tunnel.close()
+            raise
+        sock, tunnel.sock = tunnel.sock, None
+        return sock
+
+    def connect(self):
+        last_exc = OSError(f"no IPs to connect to for {self.host}")
+        for ip in self.ips:
+            try:
+                sock = self._dial(ip)
+                break
+            except OSError as exc:
+                last_exc = exc
+        else:
+            raise last_exc
+        try:
+            self.sock = self.ssl_context.wrap_socket(sock, server_hostname=self.host)
+        except Exception:
+            sock.close()
+            raise
+
+
+def https_proxy(host):
+    """Return ``(host, port, headers)`` of the HTTPS proxy for ``host``, or None.
+
+    Reads HTTPS_PROXY/https_proxy and NO_PROXY like urlopen does, so calls can leave
+    through a whitelisted fixed-IP egress proxy.
+    """
+    proxy = urllib.request.getproxies().get("https")
+    if not proxy or urllib.request.proxy_bypass(host):
+        return None
+    if "://" not in proxy:
+        proxy = f"http://{proxy}"
+    parts = urllib.parse.urlsplit(proxy)
+    headers = {}
+    if parts.username:
+        user = urllib.parse.unquote(parts.username)
+        password = urllib.parse.unquote(parts.password or "")
+        credentials = base64.b64encode(f"{user}:{password}".encode("utf-8")).decode("ascii")
+        headers["Proxy-Authorization"] = f"Basic {credentials}"
+    return parts.hostname, parts.port or (443 if parts.scheme == "https" else 80), headers
+
+
+def https_connection(netloc):
+    ips = [ip.strip() for ip in os.environ.get("WECHAT_API_HOST_IPS", "").split(",") if ip.strip()]
+    host, _, port = netloc.partition(":")
+    port = int(port) if port else None
+    proxy = https_proxy(host)
+    if ips and host == API_HOST:
+        return PinnedHTTPSConnection(host, ips, port=port, proxy=proxy)
+    if proxy:
+        proxy_host, proxy_port, proxy_headers = proxy
+        conn = http.client.HTTPSConnection(proxy_host, proxy_port)
+        conn.set_tunnel(host, port, headers=proxy_headers)
+        return conn
+    return http.client.HTTPSConnection(netloc)
+
+
+def _drop_connection(netloc, conn):
+    conn.close()
+    if _CONNECTIONS.get(netloc) is conn:
+        del _CONNECTIONS[netloc]
+
+
+def https_request(url, method="GET", body=None, headers=None, timeout=30):
+    # One keep-alive connection per host, so token/draft/publish/upload share a TLS session.
+    # draft/add, freepublish/submit and add_material are not safe to repeat: a POST is
+    # only retried when it provably never reached the server (connect failed, or a
+    # reused keep-alive socket was already dead), never on a timeout or a 5xx.
+    parts = urllib.parse.urlsplit(url)
+    target = parts.path or "/"
+    if parts.query:
+        target = f"{target}?{parts.query}"
+    idempotent = method in IDEMPOTENT_METHODS
+    for attempt in range(API_RETRIES + 1):
+        last_attempt = attempt == API_RETRIES
+        conn = _CONNECTIONS.get(parts.netloc)
+        if conn is None:
+            conn = _CONNECTIONS[parts.netloc] = https_connection(parts.netloc)
+        conn.timeout = timeout
+        reused = conn.sock is not None
+        try:
+            if reused:
+                conn.sock.settimeout(timeout)
+            else:
+                conn.connect()
+        except OSError as exc:
+            _drop_connection(parts.netloc, conn)
+            if last_attempt or not isinstance(exc, API_RETRY_ERRORS):
+                raise
+            time.sleep(API_RETRY_BACKOFF * (2**attempt))
+            continue
+        try:
+            # body may be a factory so a retried upload gets a fresh stream.
+            payload = body() if callable(body) else body
+            conn.request(method, target, body=payload, headers=headers or {})
+            resp = conn.getresponse()
+            data = resp.read()
+        except (http.client.HTTPException, OSError) as exc:
+            _drop_connection(parts.netloc, conn)
+            stale = reused and isinstance(exc, STALE_CONNECTION_ERRORS)
+            transient = idempotent and isinstance(exc, API_RETRY_ERRORS)
+            if last_attempt or not (transient or stale):
+                raise
+        else:
+            if not idempotent or resp.status not in API_RETRY_STATUSES or last_attempt:
+                if resp.status >= 400:
+                    raise RuntimeError(f"{method} {parts.path} failed with status {resp.status}")
+                return data
+        time.sleep(API_RETRY_BACKOFF * (2**attempt))
+
+
+def token_cache_path(app_id, app_secret):
+    # Keyed by both credentials so different accounts never share a token.
+    digest = hashlib.sha256(f"{app_id}:{app_secret}".encode("utf-8")).hexdigest()[:16]
+    return os.path.join(TOKEN_CACHE_DIR, f"wechat_token_{digest}.json")
+
+
+def read_cached_token(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict):
+        return None
+    if time.time() >= cached.get("expires_at", 0) - TOKEN_EXPIRY_MARGIN:
+        return None
+    return cached.get("access_token")
+
+
+def write_cached_token(path, access_token, expires_in):
+    payload = {"access_token": access_token, "expires_at": time.time() + expires_in}
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def call_with_token(get_access_token, app_id, app_secret, call):
+    token = get_access_token(app_id, app_secret)
+    result = call(token)
+    if result.get("errcode") in TOKEN_ERRCODES:
+        token = get_access_token(app_id, app_secret, refresh=True)
+        result = call(token)
+    return token, result
@@ -0,0 +1,142 @@
+import contextlib
+import io
+import json
+import os
+import socket
+import ssl
+import sys
+import tempfile
+import unittest
+import urllib.error
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+import fetch_x_trends  # noqa: E402
+
+
+def _rss(items):
+    return "<rss><channel><title>t</title>" + "".join(items) + "</channel></rss>"
+
+
+def _item(index, attr=""):
+    return (
+        f"<item><title{attr}>title {index}</title><link>https://example.com/{index}</link>"
+        "<pubDate>Wed, 14 Oct 2026 10:00:00 +0000</pubDate></item>"
+    )
+
+
+class IterFeedItemsTest(unittest.TestCase):
+    def test_large_token_across_chunk_boundary_keeps_all_items(self):
+        # A single attribute longer than a parse chunk straddles the feed() boundaries;
+        # expat >= 2.6 defers those events until close().
+        big = ' data-x="' + "x" * (fetch_x_trends.FEED_PARSE_CHUNK * 3) + '"'
+        for offset in (0, 1, 100, fetch_x_trends.FEED_PARSE_CHUNK // 2):
+            items = [_item(i, big if i == 3 else "") for i in range(6)]
+            xml_text = _rss(items).replace("<title>t</title>", f"<title>{'p' * offset}</title>")
+            parsed = fetch_x_trends._parse_feed(xml_text, "label")
+            self.assertEqual([p.url for p in parsed], [f"https://example.com/{i}" for i in range(6)])
+
+    def test_large_last_item_is_not_dropped(self):
+        big = ' data-x="' + "y" * (fetch_x_trends.FEED_PARSE_CHUNK * 2 + 7) + '"'
+        xml_text = _rss([_item(0), _item(1, big)])
+        parsed = fetch_x_trends._parse_rss_items(xml_text, "label")
+        self.assertEqual([p.text for p in parsed], ["title 0", "title 1"])
+
+
+class OpenUrlRetryTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(fetch_x_trends, "FETCH_RETRY_BACKOFF", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _open(self, *side_effect):
+        with mock.patch("urllib.request.urlopen", side_effect=side_effect) as urlopen:
+            try:
+                return fetch_x_trends._open_url("https://example.com/feed"), urlopen.call_count
+            except Exception as exc:  # noqa: BLE001
+                return exc, urlopen.call_count
+
+    def test_permanent_errors_fail_on_first_attempt(self):
+        for error in (
+            urllib.error.URLError(socket.gaierror(-2, "Name or service not known")),
+            urllib.error.URLError(ssl.SSLCertVerificationError("certificate verify failed")),
+            urllib.error.HTTPError("https://example.com/feed", 404, "Not Found", {}, None),
+        ):
+            result, calls = self._open(*[error] * 3)
+            self.assertIs(result, error)
+            self.assertEqual(calls, 1)
+
+    def test_transient_errors_are_retried(self):
+        for error in (
+            urllib.error.URLError(socket.timeout("timed out")),
+            urllib.error.URLError(ConnectionRefusedError(111, "Connection refused")),
+            ConnectionResetError(104, "Connection reset by peer"),
+            TimeoutError("The read operation timed out"),
+            urllib.error.HTTPError("https://example.com/feed", 503, "Unavailable", {}, None),
+        ):
+            response = io.BytesIO(b"ok")
+            response.headers = {}
+            result, calls = self._open(error, error, response)
+            self.assertEqual(result, ("ok", {}))
+            self.assertEqual(calls, 3)
+
+    def test_transient_errors_give_up_after_retries(self):
+        error = ConnectionResetError(104, "Connection reset by peer")
+        result, calls = self._open(*[error] * 5)
+        self.assertIs(result, error)
+        self.assertEqual(calls, fetch_x_trends.FETCH_RETRIES + 1)
+
+
+class FetchFeedCacheTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.dict(fetch_x_trends._FEED_CACHE, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_response_without_validators_drops_cache_entry(self):
+        url = "https://example.com/feed"
+        fetch_x_trends._FEED_CACHE[url] = {
+            "label": "label",
+            "etag": '"old"',
+            "last_modified": None,
+            "items": [],
+        }
+        response = (_rss([_item(0)]), None, None)
+        with mock.patch.object(fetch_x_trends, "_fetch_url_conditional", return_value=response):
+            items, _ = fetch_x_trends._fetch_feed({"label": "label", "url": url}, timeout=1)
+        self.assertEqual([item.url for item in items], ["https://example.com/0"])
+        self.assertNotIn(url, fetch_x_trends._FEED_CACHE)
+
+    def test_saved_cache_keeps_only_feeds_used_this_run(self):
+        kept, fresh = "https://example.com/kept", "https://example.com/fresh"
+        entry = {"label": "label", "etag": '"v1"', "last_modified": None, "items": []}
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        feeds_file = os.path.join(tmp.name, "feeds.txt")
+        cache_file = os.path.join(tmp.name, fetch_x_trends.FEED_CACHE_NAME)
+        with open(feeds_file, "w", encoding="utf-8") as f:
+            f.write(f"label|{kept}\nlabel|{fresh}\n")
+        with open(cache_file, "w", encoding="utf-8") as f:
+            json.dump({kept: entry, "https://example.com/removed": entry}, f)
+
+        def fetch(url, timeout, etag=None, last_modified=None):
+            return (None, etag, last_modified) if url == kept else (_rss([]), '"v2"', None)
+
+        argv = ["fetch_x_trends.py", "--mode", "feeds", "--feeds-file", feeds_file]
+        patches = [
+            mock.patch.object(sys, "argv", argv),
+            mock.patch.object(fetch_x_trends, "_fetch_url_conditional", side_effect=fetch),
+            mock.patch.object(fetch_x_trends, "_FEED_CACHE_USED", set()),
+            contextlib.redirect_stdout(io.StringIO()),
+        ]
+        with contextlib.ExitStack() as stack:
+            for patch in patches:
+                stack.enter_context(patch)
+            fetch_x_trends.main()
+        with open(cache_file, encoding="utf-8") as f:
+            self.assertEqual(sorted(json.load(f)), [fresh, kept])
+
+
+if __name__ == "__main__":
+    unittest.main()